@@ -59,6 +59,10 @@ def test(session):
     session.install("urllib3<2", "flit")
     session.run("flit", "install", "-s", "--deps", "production")
 
+    # Install the optional dependencies too, so that the code paths using
+    # them are tested. The fallbacks are tested explicitly.
+    session.install("orjson")
+
     session.install(
         "flake8",
         "pytest",
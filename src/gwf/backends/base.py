@@ -1,15 +1,29 @@
 import json
 import logging
+import os
 import os.path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 import attrs
 
 from ..utils import entry_points
-from .exceptions import TargetError
+from .exceptions import BackendError, TargetError
 
 logger = logging.getLogger(__name__)
 
+# The log of newly tracked jobs is folded into the snapshot of tracked jobs
+# once it grows larger than this many times the size of the snapshot (or of
+# the minimum size, for small snapshots).
+STATE_LOG_COMPACT_RATIO = 10
+STATE_LOG_COMPACT_MIN_SIZE = 4096
+
+# Batches of targets are split into chunks of at most this many targets, since
+# schedulers limit the size of job arrays (Slurm's default MaxArraySize is 1001).
+BATCH_SUBMIT_MAX_SIZE = 1000
+
 
 class BackendStatus(Enum):
     """BackendStatus of a target.
@@ -50,7 +64,7 @@ def list_backends():
     return set(discover_backends().keys())
 
 
-def create_backend(name, working_dir, config):
+def create_backend(name, working_dir, config, read_only=False):
     """Return backend class for the backend given by `name`.
 
     Returns the backend class registered with `name`. Note that the *class*
@@ -60,8 +74,14 @@ def create_backend(name, working_dir, config):
 
     :arg str name: Path to a workflow file, optionally specifying a
         workflow object in that file.
+    :arg bool read_only: Whether the backend will only be used to query the
+        status of targets. Cached job states may be out of date, so they are
+        only used by read-only backends and never when submitting or
+        cancelling targets.
     """
     backend_args = config.get_namespace(f"backend.{name}")
+    if not read_only:
+        backend_args.pop("state_cache_ttl", None)
     backend_cls, _ = discover_backends()[name]
     return backend_cls(working_dir=working_dir, **backend_args)
 
@@ -71,47 +91,279 @@ class TrackingBackend:
     working_dir: str = attrs.field()
     name: str = attrs.field()
     ops: object = attrs.field()
+    state_cache_ttl: int = attrs.field(default=0)
+    batch_submit: bool = attrs.field(default=False)
+    submit_workers: int = attrs.field(default=1)
 
     _tracked_jobs: dict = attrs.field(init=False, repr=False)
     _job_states: dict = attrs.field(init=False, repr=False)
+    _states_changed: bool = attrs.field(default=False, init=False, repr=False)
+    _pending_batches: dict = attrs.field(factory=dict, init=False, repr=False)
+    _pending_names: set = attrs.field(factory=set, init=False, repr=False)
+    _lock: threading.Lock = attrs.field(factory=threading.Lock, init=False, repr=False)
+    _state_log: object = attrs.field(default=None, init=False, repr=False)
 
     @_tracked_jobs.default
     def _init_tracked(self):
         try:
             with open(self._get_state_path()) as state_file:
-                return json.load(state_file)
+                tracked_jobs = json.load(state_file)
         except FileNotFoundError:
-            return {}
+            tracked_jobs = {}
+
+        # Jobs tracked since the snapshot was last written are recorded in an
+        # append-only log, one JSON-encoded [name, job_id] pair per line.
+        try:
+            with open(self._get_state_log_path()) as log_file:
+                for line in log_file:
+                    try:
+                        target_name, job_id = json.loads(line)
+                    except ValueError:
+                        logger.debug("Skipping malformed line in job log: %r", line)
+                        continue
+                    tracked_jobs[target_name] = job_id
+        except FileNotFoundError:
+            pass
+        return tracked_jobs
 
     @_job_states.default
     def _init_status(self):
-        return self.ops.get_job_states(list(self._tracked_jobs.values()))
+        tracked_jobs = list(self._tracked_jobs.values())
+        if self.state_cache_ttl <= 0 or not tracked_jobs:
+            return self.ops.get_job_states(tracked_jobs)
+
+        job_states = self._load_cached_states()
+        if job_states is not None and all(j in job_states for j in tracked_jobs):
+            logger.debug("Using cached job states")
+            return job_states
+
+        job_states = self.ops.get_job_states(tracked_jobs)
+        self._dump_cached_states(
+            {
+                job_id: job_states.get(job_id, BackendStatus.UNKNOWN)
+                for job_id in tracked_jobs
+            }
+        )
+        return job_states
 
     def _get_state_path(self):
         return os.path.join(
             self.working_dir, ".gwf", f"{self.name}-backend-tracked.json"
         )
 
+    def _get_state_log_path(self):
+        return os.path.join(
+            self.working_dir, ".gwf", f"{self.name}-backend-tracked.log"
+        )
+
+    def _get_state_cache_path(self):
+        return os.path.join(
+            self.working_dir, ".gwf", f"{self.name}-backend-states.json"
+        )
+
+    def _load_cached_states(self):
+        path = self._get_state_cache_path()
+        try:
+            if time.time() - os.stat(path).st_mtime > self.state_cache_ttl:
+                return None
+            with open(path) as cache_file:
+                entries = json.load(cache_file)
+            return {job_id: BackendStatus[state] for job_id, state in entries}
+        except FileNotFoundError:
+            return None
+        except (KeyError, TypeError, ValueError):
+            logger.debug("Discarding malformed job state cache %s", path)
+            self._invalidate_cached_states()
+            return None
+
+    def _dump_cached_states(self, job_states):
+        # Job ids may be integers (e.g. for the local backend), so we store a
+        # list of pairs instead of a mapping to preserve their type.
+        entries = [[job_id, state.name] for job_id, state in job_states.items()]
+        path = self._get_state_cache_path()
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as cache_file:
+                json.dump(entries, cache_file)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.debug("Could not write job state cache to %s", path, exc_info=True)
+
+    def _invalidate_cached_states(self):
+        try:
+            os.remove(self._get_state_cache_path())
+        except FileNotFoundError:
+            pass
+
     def status(self, target):
         job_id = self._tracked_jobs.get(target.name)
         return self._job_states.get(job_id, BackendStatus.UNKNOWN)
 
     def submit(self, target, dependencies):
+        self._submit(target, dependencies)
+
+    def _submit(self, target, dependencies, on_submit=None):
+        if self.batch_submit and not dependencies:
+            # Targets without dependencies are held back and submitted
+            # together with other targets requesting the same resources.
+            key = tuple(sorted(target.options.items()))
+            self._pending_batches.setdefault(key, []).append(target)
+            self._pending_names.add(target.name)
+            return
+
+        if any(dep.name in self._pending_names for dep in dependencies):
+            # Some dependencies are waiting to be submitted in a batch, so we
+            # need to submit those first to know their job ids. We can't rely
+            # on the tracked jobs here, since they may still hold the job id
+            # from an earlier submission of the dependency.
+            self._submit_pending_batches(on_submit)
+
         dependency_ids = [self._tracked_jobs[dep.name] for dep in dependencies]
         job_id = self.ops.submit_target(target, dependency_ids)
-        self._tracked_jobs[target.name] = job_id
-        self._job_states[job_id] = BackendStatus.SUBMITTED
+        self._track(target, job_id, on_submit)
+
+    def submit_many(self, submissions, on_submit=None):
+        """Submit a list of ``(target, dependencies)`` pairs.
+
+        Every target must appear after its dependencies. If `submit_workers` is
+        larger than one, targets are submitted concurrently and each target is
+        submitted as soon as its own dependencies have been submitted.
+
+        If given, `on_submit` is called with each target once it has been
+        submitted, possibly from another thread. Targets submitted before a
+        submission fails are thus still reported.
+        """
+        if self.submit_workers <= 1 or self.batch_submit:
+            for target, dependencies in submissions:
+                self._submit(target, dependencies, on_submit)
+            # Submit targets held back for batching now, so that they are
+            # submitted by the time this method returns.
+            self._submit_pending_batches(on_submit)
+            return
+
+        futures = {}
+
+        def _submit_after_dependencies(target, dependencies):
+            # Since targets are queued after their dependencies, a dependency
+            # has always been picked up by a worker before this runs, so
+            # waiting for it here cannot deadlock the pool.
+            for dep in dependencies:
+                if dep.name in futures:
+                    futures[dep.name].result()
+            self._submit(target, dependencies, on_submit)
+
+        with ThreadPoolExecutor(max_workers=self.submit_workers) as executor:
+            for target, dependencies in submissions:
+                futures[target.name] = executor.submit(
+                    _submit_after_dependencies, target, dependencies
+                )
+            for future in futures.values():
+                future.result()
+
+    def _submit_pending_batches(self, on_submit=None):
+        pending_batches, self._pending_batches = self._pending_batches, {}
+        self._pending_names.clear()
+        for batch in pending_batches.values():
+            for idx in range(0, len(batch), BATCH_SUBMIT_MAX_SIZE):
+                targets = batch[idx : idx + BATCH_SUBMIT_MAX_SIZE]
+                if len(targets) == 1:
+                    job_ids = [self.ops.submit_target(targets[0], [])]
+                else:
+                    job_ids = self.ops.submit_targets(targets)
+                for target, job_id in zip(targets, job_ids):
+                    self._track(target, job_id, on_submit)
+
+    def _track(self, target, job_id, on_submit=None):
+        with self._lock:
+            self._tracked_jobs[target.name] = job_id
+            self._job_states[job_id] = BackendStatus.SUBMITTED
+            self._states_changed = True
+
+            if self._state_log is None:
+                self._state_log = open(self._get_state_log_path(), "a")
+            self._state_log.write(json.dumps([target.name, job_id]) + "\n")
+            self._state_log.flush()
+
+        if on_submit is not None:
+            on_submit(target)
+
+    def _compact_state_log(self):
+        state_path = self._get_state_path()
+        log_path = self._get_state_log_path()
+        try:
+            log_size = os.path.getsize(log_path)
+        except FileNotFoundError:
+            return
+        try:
+            snapshot_size = os.path.getsize(state_path)
+        except FileNotFoundError:
+            snapshot_size = 0
+        threshold = max(snapshot_size, STATE_LOG_COMPACT_MIN_SIZE)
+        if log_size <= STATE_LOG_COMPACT_RATIO * threshold:
+            return
+
+        logger.debug("Compacting job log %s into %s", log_path, state_path)
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "w") as state_file:
+            json.dump(self._tracked_jobs, state_file)
+        os.replace(tmp_path, state_path)
+        # If we crash before the log is removed, replaying it again is harmless.
+        os.remove(log_path)
 
     def cancel(self, target):
         try:
             self.ops.cancel_job(self._tracked_jobs[target.name])
         except KeyError as exc:
             raise TargetError(target.name) from exc
+        self._states_changed = True
+
+    def cancel_many(self, targets):
+        """Cancel all `targets` that are currently submitted or running.
+
+        If the backend operations provide a ``cancel_jobs`` method, all jobs are
+        cancelled with a single call to it. Returns a list of the targets that
+        were not cancelled, either because they are not submitted or running,
+        or because cancelling them failed.
+        """
+        job_ids = {}
+        for target in targets:
+            job_id = self._tracked_jobs.get(target.name)
+            if self._job_states.get(job_id) in (
+                BackendStatus.SUBMITTED,
+                BackendStatus.RUNNING,
+            ):
+                job_ids[target.name] = job_id
+
+        failed = set()
+        if job_ids:
+            if hasattr(self.ops, "cancel_jobs"):
+                failed.update(self.ops.cancel_jobs(list(job_ids.values())))
+            else:
+                for job_id in job_ids.values():
+                    try:
+                        self.ops.cancel_job(job_id)
+                    except BackendError:
+                        failed.add(job_id)
+            self._states_changed = True
+        return [
+            target
+            for target in targets
+            if target.name not in job_ids or job_ids[target.name] in failed
+        ]
 
     def close(self):
-        self.ops.close()
-        with open(self._get_state_path(), "w") as state_file:
-            json.dump(self._tracked_jobs, state_file)
+        try:
+            # Targets are normally flushed by submit_many(), but targets
+            # batched through submit() are only submitted here.
+            self._submit_pending_batches()
+        finally:
+            self.ops.close()
+            if self._states_changed:
+                self._invalidate_cached_states()
+            if self._state_log is not None:
+                self._state_log.close()
+                self._state_log = None
+                self._compact_state_log()
 
     @property
     def target_defaults(self):
@@ -25,6 +25,9 @@ To run your workflow, open another terminal and then type::
 
 To stop the pool of workers press :kbd:`Control-c`.
 
+Communication with the workers is faster if the optional `orjson` package is
+installed, e.g. with ``pip install gwf[fast]``.
+
 **Backend options:**
 
 * **local.host (str):** Set the host that the workers are running on
@@ -42,15 +45,21 @@ import itertools
 import json
 import logging
 import multiprocessing
+import selectors
 import socket
+import struct
 import time
 from enum import Enum
-from io import TextIOWrapper
 from pathlib import Path
 from typing import Generator
 
 import attrs
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 from .base import BackendStatus, TrackingBackend
 from .exceptions import BackendError
 
@@ -84,23 +93,43 @@ STATUS_MAP = {
 }
 
 
-class CustomEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, LocalStatus):
-            return obj.name
-        return json.JSONEncoder.default(self, obj)
+def _default(obj):
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj):
+    return json.dumps(obj, default=_default).encode("utf-8")
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Use orjson for (de)serializing messages if it's installed, since it is
+# considerably faster than the json module and produces bytes directly.
+if orjson is not None:
+    _dumps, _loads = _orjson_dumps, orjson.loads
+else:  # pragma: no cover
+    _dumps, _loads = _json_dumps, json.loads
+
+
+# Every message is a JSON object prefixed with its length in bytes, encoded
+# as a 4-byte big-endian unsigned integer.
+HEADER = struct.Struct(">I")
 
 
 def decode(data):
-    msg = json.loads(data.strip())
+    msg = _loads(data)
     kind = msg.pop("__kind__")
     return kind, msg
 
 
 def encode(kind, **kwargs):
     payload = dict(__kind__=kind, **kwargs)
-    data = json.dumps(payload, cls=CustomEncoder) + "\n"
-    return data
+    data = _dumps(payload)
+    return HEADER.pack(len(data)) + data
 
 
 @attrs.frozen
@@ -108,21 +137,30 @@ class Client:
     """A client for communicating with the local backend server."""
 
     sock: socket.socket = attrs.field(hash=False)
-    reader: TextIOWrapper = attrs.field(repr=False)
-    writer: TextIOWrapper = attrs.field(repr=False)
 
     @classmethod
     def from_socket(cls, sock):
-        reader = sock.makefile(encoding="utf-8", mode="r")
-        writer = sock.makefile(encoding="utf-8", mode="w")
-        return cls(sock=sock, reader=reader, writer=writer)
+        return cls(sock=sock)
 
     def send(self, kind, **msg):
-        self.writer.write(encode(kind, **msg))
-        self.writer.flush()
+        # Each message is sent with a single call, so it is never split into
+        # several small writes.
+        self.sock.sendall(encode(kind, **msg))
+
+    def _recv_exact(self, size):
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = self.sock.recv_into(view[received:])
+            if n == 0:
+                raise ConnectionError("Connection closed by the server")
+            received += n
+        return buf
 
     def recv(self):
-        return decode(self.reader.readline())
+        (size,) = HEADER.unpack(self._recv_exact(HEADER.size))
+        return decode(self._recv_exact(size))
 
     @classmethod
     def connect(cls, hostname=DEFAULT_HOST, port=DEFAULT_PORT, attempts=20):
@@ -130,6 +168,10 @@ class Client:
             try:
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 sock.connect((hostname, port))
+                # Messages are small and sent one at a time, so don't let
+                # Nagle's algorithm hold them back. The server side doesn't
+                # need this since asyncio enables TCP_NODELAY by default.
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 return cls.from_socket(sock)
             except OSError:
                 retry_delay = 2**attempts_used
@@ -158,7 +200,7 @@ class Client:
         self.send("get_task_states")
         msg_type, response = self.recv()
         assert msg_type == "task_states", "invalid response received"
-        return {k: LocalStatus[v] for k, v in response["tasks"].items()}
+        return {k: LocalStatus(v) for k, v in response["tasks"].items()}
 
     def cancel(self, job_id):
         self.send("cancel_task", tid=job_id)
@@ -242,6 +284,9 @@ class Scheduler:
     events: asyncio.Queue = attrs.field(factory=asyncio.Queue)
     task_states: dict = attrs.field(factory=dict)
     tasks: dict = attrs.field(factory=dict)
+    # Incremented whenever the state of a task changes. This allows clients
+    # of the scheduler to cache anything derived from the task states.
+    states_version: int = attrs.field(default=0)
 
     # Ressources
     cores_ressource: asyncio.Semaphore = attrs.field()
@@ -250,6 +295,10 @@ class Scheduler:
     def create_cores_ressource(self):
         return asyncio.Semaphore(self.max_cores)
 
+    def _set_task_state(self, tid, state):
+        self.task_states[tid] = state
+        self.states_version += 1
+
     async def enqueue_task(self, name, script, working_dir, time_limit, deps):
         tid = next(self.tid_generator)
         worker_task = asyncio.create_task(
@@ -263,14 +312,14 @@ class Scheduler:
             )
         )
         self.tasks[tid] = worker_task
-        self.task_states[tid] = LocalStatus.SUBMITTED
+        self._set_task_state(tid, LocalStatus.SUBMITTED)
         return tid
 
     async def cancel_task(self, tid):
         if self.task_states[tid] in (LocalStatus.SUBMITTED, LocalStatus.RUNNING):
             worker_task = self.tasks[tid]
             worker_task.cancel()
-            self.task_states[tid] = LocalStatus.CANCELLED
+            self._set_task_state(tid, LocalStatus.CANCELLED)
 
     async def kill(self):
         for worker in self.tasks.values():
@@ -293,55 +342,56 @@ class Scheduler:
         tasks = {self.tasks[tid] for tid in tids}
         await asyncio.wait(tasks, timeout=timeout)
 
-    async def _gentle_kill(self, proc):
-        if proc is None:
+    async def _gentle_kill(self, proc, grace_period=10):
+        if proc is None or proc.returncode is not None:
             return
 
-        proc.kill()
-        await asyncio.sleep(1)
-        if proc.returncode is None:
-            await asyncio.sleep(10)
+        # Ask the process to terminate and wait for it to exit, but only as
+        # long as necessary. If it hasn't exited after the grace period, kill it.
+        try:
             proc.terminate()
-        await proc.wait()
+            await asyncio.wait_for(proc.wait(), timeout=grace_period)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
 
     async def try_handle_task(self, tid, name, script, working_dir, time_limit, deps):
         proc = None
+        acquired = False
         try:
-            if deps:
-                await asyncio.wait(
-                    {self.tasks[tid] for tid in deps},
-                    return_when=asyncio.ALL_COMPLETED,
+            # Wait for dependencies one at a time so that a failing dependency
+            # fails this task right away instead of after all others finish.
+            waiting = {self.tasks[dep_tid]: dep_tid for dep_tid in deps}
+            while waiting:
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
                 )
-                for dep_tid in deps:
-                    if self.task_states[dep_tid] != LocalStatus.COMPLETED:
-                        self.task_states[tid] = self.task_states[dep_tid]
+                for dep_task in done:
+                    dep_state = self.task_states[waiting.pop(dep_task)]
+                    if dep_state != LocalStatus.COMPLETED:
+                        self._set_task_state(tid, dep_state)
                         return
 
             await self.cores_ressource.acquire()
-            self.task_states[tid] = LocalStatus.RUNNING
-
-            proc = await asyncio.create_subprocess_shell(
-                script,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=working_dir,
-            )
+            acquired = True
+            self._set_task_state(tid, LocalStatus.RUNNING)
+
+            # Output is written directly to the log files by the task, so it
+            # never has to be held in memory here.
+            logs_dir = self.working_dir.joinpath(".gwf", "logs")
+            with open(logs_dir.joinpath(f"{name}.stdout"), "wb") as stdout_file:
+                with open(logs_dir.joinpath(f"{name}.stderr"), "wb") as stderr_file:
+                    proc = await asyncio.create_subprocess_shell(
+                        script,
+                        stdout=stdout_file,
+                        stderr=stderr_file,
+                        cwd=working_dir,
+                    )
             try:
                 logger.debug("task starting")
-                stdout, stderr = await asyncio.wait_for(
-                    proc.communicate(), timeout=time_limit
-                )
-                logger.debug("writing log files")
-                # TODO: This should be made streaming..
-                with open(
-                    self.working_dir.joinpath(".gwf", "logs", f"{name}.stdout"), "wb"
-                ) as log_file:
-                    log_file.write(stdout)
-                with open(
-                    self.working_dir.joinpath(".gwf", "logs", f"{name}.stderr"), "wb"
-                ) as log_file:
-                    log_file.write(stderr)
-                logger.debug("wrote log files")
+                await asyncio.wait_for(proc.wait(), timeout=time_limit)
             except asyncio.TimeoutError:
                 raise TimeLimitExceededError()
 
@@ -350,17 +400,33 @@ class Scheduler:
         except asyncio.CancelledError:
             logger.debug("got cancel for task")
             await self._gentle_kill(proc)
-            self.task_states[tid] = LocalStatus.CANCELLED
+            self._set_task_state(tid, LocalStatus.CANCELLED)
             logger.debug("task states after cancel: %s", self.task_states)
         except TimeLimitExceededError:
             await self._gentle_kill(proc)
-            self.task_states[tid] = LocalStatus.KILLED
+            self._set_task_state(tid, LocalStatus.KILLED)
         except TaskFailedError:
-            self.task_states[tid] = LocalStatus.FAILED
+            self._set_task_state(tid, LocalStatus.FAILED)
         else:
-            self.task_states[tid] = LocalStatus.COMPLETED
+            self._set_task_state(tid, LocalStatus.COMPLETED)
         finally:
-            self.cores_ressource.release()
+            # Only give back cores we actually took, otherwise tasks skipped
+            # because of a failed dependency would raise the core limit.
+            if acquired:
+                self.cores_ressource.release()
+
+
+def _quickack(sock):
+    """Ask the kernel to acknowledge incoming data on `sock` right away.
+
+    Replies are only sent once a whole request has been read, so a delayed ACK
+    adds latency to every round trip. The option is Linux-only and the kernel
+    clears it again after a while, so it must be set after each read.
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    except (AttributeError, OSError):
+        pass
 
 
 @attrs.define
@@ -368,50 +434,87 @@ class Server:
     scheduler: Scheduler = attrs.field()
     server: asyncio.base_events.Server = attrs.field(default=None)
 
+    # The encoded task_states response and the version of the task states it
+    # was created from.
+    _states_response: tuple = attrs.field(default=(None, b""), repr=False)
+
     async def send_response(self, writer, kind, **kwargs):
-        writer.write(encode(kind, **kwargs).encode("utf-8"))
+        writer.write(encode(kind, **kwargs))
         await writer.drain()
 
+    async def handle_enqueue_task(
+        self, writer, name, script, working_dir, deps, time_limit=None
+    ):
+        tid = await self.scheduler.enqueue_task(
+            name=name,
+            script=script,
+            time_limit=time_limit,
+            working_dir=working_dir,
+            deps=deps,
+        )
+        await self.send_response(writer, "task_enqueued", tid=tid)
+
+    async def handle_get_task_state(self, writer, tid):
+        state = self.scheduler.get_task_state(tid)
+        await self.send_response(
+            writer, "task_state", state=state.value if state is not None else None
+        )
+
+    async def handle_get_task_states(self, writer):
+        version, response = self._states_response
+        if version != self.scheduler.states_version:
+            version = self.scheduler.states_version
+            tasks = {
+                tid: state.value
+                for tid, state in self.scheduler.get_task_states().items()
+            }
+            response = encode("task_states", tasks=tasks)
+            self._states_response = (version, response)
+        writer.write(response)
+        await writer.drain()
+
+    async def handle_cancel_task(self, writer, tid):
+        await self.scheduler.cancel_task(tid)
+
+    async def handle_shutdown(self, writer):
+        self.server.close()
+        await self.server.wait_closed()
+        return True
+
+    async def handle_close(self, writer):
+        return True
+
+    # Maps message kinds to handlers. A handler returns True if the connection
+    # should be closed after handling the message.
+    HANDLERS = {
+        "enqueue_task": handle_enqueue_task,
+        "get_task_state": handle_get_task_state,
+        "get_task_states": handle_get_task_states,
+        "cancel_task": handle_cancel_task,
+        "shutdown": handle_shutdown,
+        "close": handle_close,
+    }
+
     async def handle_connection(self, reader, writer):
+        handlers = self.HANDLERS
+        sock = writer.get_extra_info("socket")
         while True:
-            data = await reader.readline()
-            if data is None:
-                break
-            message = json.loads(data)
-
-            kind = message.pop("__kind__")
-            if kind == "enqueue_task":
-                tid = await self.scheduler.enqueue_task(
-                    name=message.pop("name"),
-                    script=message.pop("script"),
-                    time_limit=message.pop("time_limit", None),
-                    working_dir=message.pop("working_dir"),
-                    deps=message.pop("deps"),
-                )
-                await self.send_response(
-                    writer,
-                    "task_enqueued",
-                    tid=tid,
-                )
-            elif kind == "get_task_state":
-                tid = message.pop("tid")
-                await self.send_response(
-                    writer, "task_state", state=self.scheduler.get_task_state(tid)
-                )
-            elif kind == "get_task_states":
-                await self.send_response(
-                    writer, "task_states", tasks=self.scheduler.get_task_states()
-                )
-            elif kind == "cancel_task":
-                tid = message.pop("tid")
-                await self.scheduler.cancel_task(tid)
-            elif kind == "shutdown":
-                self.server.close()
-                await self.server.wait_closed()
+            try:
+                header = await reader.readexactly(HEADER.size)
+                (size,) = HEADER.unpack(header)
+                kind, message = decode(await reader.readexactly(size))
+            except asyncio.IncompleteReadError:
+                # The client disconnected without saying goodbye.
                 break
-            elif kind == "close":
+            if sock is not None:
+                _quickack(sock)
+
+            handler = handlers.get(kind)
+            if handler is None:
+                logger.warning("Received message of unknown kind %s", kind)
+                continue
+            if await handler(self, writer, **message):
                 break
-            assert not message, f"message of kind {kind} has not been fully parsed"
 
     async def start_server(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
         self.server = await asyncio.start_server(
@@ -436,8 +539,28 @@ async def start_cluster_async(working_dir, max_cores, host, port):
     await s.start_server(host, port)
 
 
+def _new_poll_event_loop():
+    """Create an event loop backed by `poll()`.
+
+    The server only watches a handful of sockets and pipes, and for so few
+    file descriptors `poll()` is cheaper than the `epoll()` selector used by
+    default on Linux, since it doesn't need a system call to register or
+    unregister each descriptor.
+    """
+    return asyncio.SelectorEventLoop(selectors.PollSelector())
+
+
 def start_cluster(*args, debug=False, **kwargs):
-    asyncio.run(start_cluster_async(*args, **kwargs), debug=debug)
+    coro = start_cluster_async(*args, **kwargs)
+    # PollSelector is not available on Windows, where the default event loop
+    # must be used anyway to support subprocesses. Passing our own loop
+    # without touching the global event loop policy requires asyncio.Runner
+    # (Python 3.11+), so older versions also use the default event loop.
+    if hasattr(selectors, "PollSelector") and hasattr(asyncio, "Runner"):
+        with asyncio.Runner(debug=debug, loop_factory=_new_poll_event_loop) as runner:
+            runner.run(coro)
+    else:
+        asyncio.run(coro, debug=debug)
 
 
 @attrs.frozen
@@ -66,10 +66,6 @@ class LSFOps:
 
     def submit_target(self, target, dependencies):
         script = self.compile_script(target)
-        with open(
-            os.path.join(self.working_dir, ".gwf", "logs", target.name + ".sh"), "w"
-        ) as f:
-            f.write(script)
         args = []
         if dependencies:
             args.append("-w")
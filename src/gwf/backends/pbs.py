@@ -6,7 +6,11 @@ the commands `qsub` and `qstat`.
 
 **Backend options:**
 
-None.
+* **backend.pbs.state_cache_ttl (int):** If larger than zero, job states
+  fetched from PBS are cached in the `.gwf` directory for this many seconds
+  and reused by subsequent ``gwf status`` invocations. Since cached states
+  may be out of date, the cache is never used when submitting or cancelling
+  targets, and it is discarded whenever they are (default: 0).
 
 **Target options:**
 
@@ -25,7 +29,7 @@ import re
 
 import attrs
 
-from ..utils import ensure_trailing_newline
+from ..utils import ensure_trailing_newline, timer
 from .base import BackendStatus, TrackingBackend
 from .utils import call, has_exe
 
@@ -51,6 +55,27 @@ PBS_STATES = {
     "U": BackendStatus.UNKNOWN,
 }
 
+QSTAT_STANZA_SEP = re.compile(r"\n\s*\n")
+QSTAT_JOB_ID = re.compile(r"^Job Id:\s*(\S+)", re.MULTILINE)
+QSTAT_JOB_STATE = re.compile(r"^\s*job_state = (\w)", re.MULTILINE)
+
+
+def parse_qstat_full(output):
+    """Parse the output of ``qstat -f`` into a dict mapping job ids to states.
+
+    Job ids are shortened to the numeric part (e.g. ``123`` for
+    ``123.server``), matching the ids returned when submitting.
+    """
+    job_states = {}
+    for stanza in QSTAT_STANZA_SEP.split(output):
+        id_match = QSTAT_JOB_ID.search(stanza)
+        state_match = QSTAT_JOB_STATE.search(stanza)
+        if id_match is None or state_match is None:
+            continue
+        job_id = id_match.group(1).split(".")[0]
+        job_states[job_id] = PBS_STATES.get(state_match.group(1), BackendStatus.UNKNOWN)
+    return job_states
+
 
 @attrs.define
 class PBSOps:
@@ -63,16 +88,12 @@ class PBSOps:
 
     def submit_target(self, target, dependencies):
         script = self.compile_script(target)
-        script_path = os.path.join(
-            self.working_dir, ".gwf", "logs", target.name + ".sh"
-        )
-        with open(script_path, "w") as f:
-            f.write(script)
         args = []
         if dependencies:
             args.append("-W depend=afterok:" + ":".join(dependencies))
         logger.debug(f"Submitting job { target.name } to PBS")
-        stdout = call("qsub", *args, script_path).strip()
+        # When no script path is given, qsub reads the script from stdin.
+        stdout = call("qsub", *args, input=script).strip()
         job_id = stdout.split(".")[0]  # Extract job ID from the full PBS job ID
         return job_id
 
@@ -80,15 +101,12 @@ class PBSOps:
         logger.debug("Getting job states from PBS")
         if not tracked_jobs:
             return {}
-        job_states = {job_id: BackendStatus.UNKNOWN for job_id in tracked_jobs}
-        for job_id in tracked_jobs:
-            cmd = ["qstat", "-f", job_id]
-            ret = call(*cmd)
-            if "job_state" not in ret:
-                continue
-            state = re.search(r"job_state = (\w)", ret).group(1)
-            job_states[job_id] = PBS_STATES.get(state, BackendStatus.UNKNOWN)
-        return job_states
+        with timer("Loaded job states from qstat in %.3fs", logger=logger):
+            live_states = parse_qstat_full(call("qstat", "-f"))
+        return {
+            job_id: live_states.get(job_id, BackendStatus.UNKNOWN)
+            for job_id in tracked_jobs
+        }
 
     def compile_script(self, target):
         target_options = target.options
@@ -119,11 +137,12 @@ class PBSOps:
         pass
 
 
-def create_backend(working_dir):
+def create_backend(working_dir, state_cache_ttl=0):
     return TrackingBackend(
         working_dir,
         name="pbs",
         ops=PBSOps(working_dir, target_defaults=TARGET_DEFAULTS),
+        state_cache_ttl=state_cache_ttl,
     )
 
 
@@ -14,6 +14,25 @@ To use this backend you must activate the `slurm` backend.
   fetch job status from Slurm. This enables *gwf* to report when targets have
   failed (default: true).
 
+* **backend.slurm.state_cache_ttl (int):** If larger than zero, job states
+  fetched from Slurm are cached in the `.gwf` directory for this many seconds
+  and reused by subsequent ``gwf status`` invocations. Since cached states
+  may be out of date, the cache is never used when submitting or cancelling
+  targets, and it is discarded whenever they are (default: 0).
+
+* **backend.slurm.array_jobs (bool):** If enabled, targets without
+  dependencies that request the same resources are submitted together as a
+  single Slurm job array instead of one job per target. This reduces the
+  number of `sbatch` calls and the load on the Slurm controller when
+  submitting large workflows. Output from the targets is logged as usual, but
+  messages from Slurm itself, e.g. about exceeded time limits, are written to
+  `.gwf/logs/gwf-array-<array id>_<task id>.stdout` and `.stderr`
+  (default: false).
+
+* **backend.slurm.submit_workers (int):** Number of `sbatch` calls that may
+  run concurrently when submitting a workflow. Targets are only submitted
+  once all of their dependencies have been submitted (default: 1).
+
 **Target options:**
 
 * **cores (int):**
@@ -45,12 +64,15 @@ To use this backend you must activate the `slurm` backend.
 
 import logging
 import os.path
+import shlex
 from collections import defaultdict
+from functools import lru_cache
 
 import attrs
 
 from ..utils import ensure_trailing_newline
 from .base import BackendStatus, TrackingBackend
+from .exceptions import BackendError
 from .utils import call, has_exe
 
 logger = logging.getLogger(__name__)
@@ -151,6 +173,16 @@ SLURM_LONG_STATES = {
 
 SLURM_JOB_STATES = defaultdict(lambda: BackendStatus.UNKNOWN, SLURM_SHORT_STATES)
 
+# Maps long state names (as reported by sacct) directly to a backend status,
+# so that parsing sacct output only requires a single lookup per job.
+SLURM_LONG_JOB_STATES = defaultdict(
+    lambda: BackendStatus.UNKNOWN,
+    {
+        long_state: SLURM_JOB_STATES[short_state]
+        for long_state, short_state in SLURM_LONG_STATES.items()
+    },
+)
+
 
 TARGET_DEFAULTS = {
     "cores": 1,
@@ -183,6 +215,27 @@ OPTION_FLAGS = {
 OPTION_STR = "#SBATCH {0}{1}"
 
 
+@lru_cache(maxsize=None)
+def _options_template(option_names):
+    """Return a template with an ``#SBATCH`` line for each of `option_names`.
+
+    The template is meant to be formatted with the ``%`` operator using the
+    target options. Since most targets in a workflow use the same set of
+    options, templates are cached by option names.
+    """
+    return "\n".join(
+        OPTION_STR.format(OPTION_FLAGS[option_name], f"%({option_name})s")
+        for option_name in option_names
+    )
+
+
+def _options_header(options):
+    """Return the ``#SBATCH`` lines for `options`."""
+    # The rendered lines are not cached since values that compare equal, like
+    # 2, 2.0 and True, would then share lines rendered from only one of them.
+    return _options_template(tuple(options)) % options
+
+
 @attrs.define
 class SlurmOps:
     working_dir: str = attrs.field()
@@ -196,6 +249,26 @@ class SlurmOps:
         # know more.
         call("scancel", "--verbose", job_id)
 
+    def cancel_jobs(self, job_ids, batch_size=500):
+        """Cancel `job_ids` and return the ids of jobs that could not be cancelled."""
+        # scancel accepts multiple job ids, so we cancel them in batches to
+        # avoid one call per job while keeping the command line short.
+        failed = []
+        for idx in range(0, len(job_ids), batch_size):
+            batch = job_ids[idx : idx + batch_size]
+            try:
+                call("scancel", "--verbose", *batch)
+            except BackendError:
+                # A single job that has already finished fails the whole
+                # batch, so find the culprits by cancelling one at a time.
+                logger.debug("Could not cancel batch, retrying jobs one by one")
+                for job_id in batch:
+                    try:
+                        call("scancel", "--verbose", job_id)
+                    except BackendError:
+                        failed.append(job_id)
+        return failed
+
     def submit_target(self, target, dependencies):
         script = self.compile_script(target)
         args = ["--parsable"]
@@ -203,13 +276,24 @@ class SlurmOps:
             args.append("--dependency=afterok:{}".format(":".join(dependencies)))
         return call("sbatch", *args, input=script).strip()
 
+    def submit_targets(self, targets):
+        script = self.compile_array_script(targets)
+        array_job_id = call("sbatch", "--parsable", input=script).strip()
+        # With --parsable, sbatch may return "jobid;cluster".
+        array_job_id = array_job_id.split(";")[0]
+        return [f"{array_job_id}_{idx}" for idx in range(len(targets))]
+
     def get_job_states_from_squeue(self, tracked_jobs):
         logger.debug("Loading job states from squeue")
+        tracked_jobs = set(tracked_jobs)
         job_states = {}
+        # The --array flag makes squeue list each task of a job array on its
+        # own line, so that tasks submitted by submit_targets() are reported
+        # with their full id (e.g. 1234_5), even when pending.
         for line in call(
-            "squeue", "--noheader", "--format=%i;%t", "--all"
-        ).splitlines():
-            job_id, state = line.strip().split(";")
+            "squeue", "--noheader", "--format=%i;%t", "--all", "--array"
+        ).split():
+            job_id, _, state = line.partition(";")
             if job_id in tracked_jobs:
                 job_states[job_id] = SLURM_JOB_STATES[state]
         return job_states
@@ -234,8 +318,7 @@ class SlurmOps:
             # instead of a sensible, parsable value. So we do our best to clean
             # it up here.
             state = state.split()[0]
-            state = SLURM_LONG_STATES[state]
-            job_states[job_id] = SLURM_JOB_STATES[state]
+            job_states[job_id] = SLURM_LONG_JOB_STATES[state]
         return job_states
 
     def get_job_states_from_sacct_batched(self, tracked_jobs, batch_size=1024):
@@ -260,8 +343,8 @@ class SlurmOps:
 
         out.append(OPTION_STR.format("--job-name=", target.name))
 
-        for option_name, option_value in target.options.items():
-            out.append(OPTION_STR.format(OPTION_FLAGS[option_name], option_value))
+        if target.options:
+            out.append(_options_header(target.options))
 
         if self.log_mode == "full":
             out.append(
@@ -301,17 +384,80 @@ class SlurmOps:
         out.append(ensure_trailing_newline(target.spec))
         return "\n".join(out)
 
+    def compile_array_script(self, targets):
+        out = []
+        out.append("#!/bin/bash")
+        out.append("# Generated by: gwf")
+
+        out.append(OPTION_STR.format("--job-name=", "gwf-array"))
+
+        # All targets in an array share the same options.
+        options = targets[0].options
+        if options:
+            out.append(_options_header(options))
+
+        out.append(OPTION_STR.format("--array=", "0-{}".format(len(targets) - 1)))
+        # Each task redirects its own output to the logs of its target below,
+        # but messages from Slurm itself (e.g. when a task exceeds its time
+        # limit) are written to the log of the array task.
+        if self.log_mode == "none":
+            out.append(OPTION_STR.format("--output=", "/dev/null"))
+        else:
+            array_log_path = os.path.join(
+                self.working_dir, ".gwf", "logs", "gwf-array-%A_%a"
+            )
+            out.append(OPTION_STR.format("--output=", array_log_path + ".stdout"))
+            if self.log_mode == "full":
+                out.append(OPTION_STR.format("--error=", array_log_path + ".stderr"))
+
+        out.append("")
+        out.append('case "$SLURM_ARRAY_TASK_ID" in')
+        for idx, target in enumerate(targets):
+            stdout_path = shlex.quote(
+                os.path.join(self.working_dir, ".gwf", "logs", target.name + ".stdout")
+            )
+            stderr_path = shlex.quote(
+                os.path.join(self.working_dir, ".gwf", "logs", target.name + ".stderr")
+            )
+
+            out.append("{})".format(idx))
+            if self.log_mode == "full":
+                out.append("exec >{} 2>{}".format(stdout_path, stderr_path))
+            elif self.log_mode == "merged":
+                out.append("exec >{} 2>&1".format(stdout_path))
+            out.append("cd {}".format(target.working_dir))
+            # Use the same id for the task as the one gwf tracks it by.
+            out.append("export GWF_JOBID=${SLURM_ARRAY_JOB_ID}_${SLURM_ARRAY_TASK_ID}")
+            out.append('export GWF_TARGET_NAME="{}"'.format(target.name))
+            out.append("set -e")
+            out.append("")
+            out.append(ensure_trailing_newline(target.spec))
+            out.append(";;")
+        out.append("esac")
+        out.append("")
+        return "\n".join(out)
+
     def close(self):
         pass
 
 
-def create_backend(working_dir, log_mode="full", accounting_enabled=True):
+def create_backend(
+    working_dir,
+    log_mode="full",
+    accounting_enabled=True,
+    state_cache_ttl=0,
+    array_jobs=False,
+    submit_workers=1,
+):
     return TrackingBackend(
         working_dir,
         name="slurm",
         ops=SlurmOps(
             working_dir, log_mode, accounting_enabled, target_defaults=TARGET_DEFAULTS
         ),
+        state_cache_ttl=state_cache_ttl,
+        batch_submit=array_jobs,
+        submit_workers=submit_workers,
     )
 
 
@@ -1,12 +1,50 @@
+import logging
+import os
 import shutil
 import subprocess
+from functools import lru_cache
 
 from .exceptions import BackendError
 
+logger = logging.getLogger(__name__)
+
+
+def _override_var(name):
+    return f"GWF_{name.upper()}_PATH"
+
+
+@lru_cache(maxsize=None)
+def _which(name):
+    # The location of an executable can be given explicitly through an
+    # environment variable, e.g. GWF_SBATCH_PATH=/opt/slurm/bin/sbatch, which
+    # skips the search through PATH.
+    var_name = _override_var(name)
+    exe = os.environ.get(var_name)
+    if exe is not None:
+        # Resolve the path, so that a bare name also becomes an absolute path.
+        path = shutil.which(exe)
+        if path is None:
+            logger.warning(
+                'The executable "%s" given by %s does not exist or is not '
+                "executable.",
+                exe,
+                var_name,
+            )
+        return path
+    # Lookups are cached since searching PATH requires a stat() call per
+    # directory, which can be slow on network file systems.
+    return shutil.which(name)
+
 
 def _find_exe(name):
-    exe = shutil.which(name)
+    exe = _which(name)
     if exe is None:
+        var_name = _override_var(name)
+        if var_name in os.environ:
+            raise BackendError(
+                f'The executable "{os.environ[var_name]}" given by {var_name} '
+                f"does not exist or is not executable."
+            )
         raise BackendError(
             f'Could not find executable "{name}". This backend requires Slurm '
             f"to be installed on this host."
@@ -15,17 +53,22 @@ def _find_exe(name):
 
 
 def has_exe(name):
-    return shutil.which(name) is not None
+    return _which(name) is not None
 
 
 def call(executable_name, *args, input=None):
     executable_path = _find_exe(executable_name)
+    # With an absolute executable path and close_fds=False, CPython can use
+    # posix_spawn() instead of fork()/exec(), which avoids copying the page
+    # tables of a large gwf process for each call. File descriptors created by
+    # Python are non-inheritable by default, so nothing leaks to the child.
     proc = subprocess.Popen(
         [executable_path] + list(args),
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         stdin=subprocess.PIPE,
         universal_newlines=True,
+        close_fds=False,
     )
     stdout, stderr = proc.communicate(input)
 
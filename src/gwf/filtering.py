@@ -1,4 +1,5 @@
 import fnmatch
+import re
 
 
 class ApplyMixin:
@@ -44,19 +45,19 @@ class StatusFilter(ApplyMixin):
 class NameFilter:
     def __init__(self, patterns):
         self.patterns = patterns
+        self._regexes = [re.compile(fnmatch.translate(p)) for p in patterns]
 
     def apply(self, targets):
-        target_name_map = {target.name: target for target in targets}
         return {
-            target_name_map[name]
-            for pattern in self.patterns
-            for name in fnmatch.filter(target_name_map.keys(), pattern)
+            target
+            for target in targets
+            if any(regex.match(target.name) for regex in self._regexes)
         }
 
 
 class EndpointFilter(ApplyMixin):
     def __init__(self, endpoints, mode="include"):
-        self.endpoints = endpoints
+        self.endpoints = frozenset(endpoints)
         self.mode = mode
 
     def predicate(self, target):
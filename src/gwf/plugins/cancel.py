@@ -8,6 +8,24 @@ from ..filtering import filter_names
 
 
 def cancel_many(backend, targets):
+    if hasattr(backend, "cancel_many"):
+        for target in targets:
+            click.echo("Cancelling target {}".format(target.name), err=True)
+        try:
+            not_cancelled = backend.cancel_many(targets)
+        except UnsupportedOperationError:
+            click.echo("Cancelling targets is not supported by this backend", err=True)
+            raise click.Abort()
+        except BackendError as exc:
+            click.echo(f"Some targets could not be cancelled: {exc}")
+            return
+        for target in not_cancelled:
+            click.echo(
+                f"Target {target.name} could not be cancelled "
+                "(maybe not running or submitted?)"
+            )
+        return
+
     for target in targets:
         try:
             click.echo("Cancelling target {}".format(target.name), err=True)
@@ -1,6 +1,7 @@
 import logging
 import os
 import os.path
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 
@@ -10,6 +11,10 @@ from ..filtering import EndpointFilter, NameFilter, filter_generic
 
 logger = logging.getLogger(__name__)
 
+# Deleting a file is a single independent syscall, but on network filesystems
+# each one costs a round trip, so we keep many of them in flight at once.
+DELETE_WORKERS = 32
+
 
 def _format_size(num, suffix="B"):
     # Implementation taken from:
@@ -21,12 +26,29 @@ def _format_size(num, suffix="B"):
     return "%.1f%s%s" % (num, "Yi", suffix)
 
 
+def _file_size(path):
+    """Return the size of the file at `path` or `None` if it does not exist.
+
+    Symlinks are not followed, so a dangling symlink still exists (and will be
+    deleted). If the file can't be inspected, e.g. due to permissions, its size
+    is reported as zero so that deleting it is still attempted.
+    """
+    try:
+        return os.lstat(path).st_size
+    except FileNotFoundError:
+        return None
+    except OSError:
+        logger.debug("Could not get size of %s", path, exc_info=True)
+        return 0
+
+
 def _delete_file(path):
     try:
         os.remove(path)
+    except FileNotFoundError:
+        return
     except OSError:
-        msg = "Error when attempting to delete {}, maybe the file did not exist"
-        logger.debug(msg.format(path))
+        logger.debug("Error when attempting to delete %s", path, exc_info=True)
 
 
 @click.command()
@@ -55,15 +77,15 @@ def clean(ctx, targets, all, force):
 
     matches = list(filter_generic(targets=graph, filters=filters))
 
-    total_size = sum(
-        (
-            os.path.getsize(path)
-            if os.path.exists(path) and path not in target.protected()
-            else 0
-        )
-        for target in matches
-        for path in target.flattened_outputs()
-    )
+    # Stat each unprotected output once. The sizes are reused when deleting so
+    # that files we already know are missing are not touched again.
+    protected = [target.protected() for target in matches]
+    sizes = {}
+    for target, target_protected in zip(matches, protected):
+        for path in target.flattened_outputs():
+            if path not in target_protected and path not in sizes:
+                sizes[path] = _file_size(path)
+    total_size = sum(size for size in sizes.values() if size is not None)
 
     logger.info("Will delete %s of files!", _format_size(total_size))
 
@@ -76,14 +98,15 @@ def clean(ctx, targets, all, force):
             abort=True,
         )
 
+    to_delete = []
     with get_spec_hashes(working_dir=ctx.working_dir, config=ctx.config) as spec_hashes:
-        for target in matches:
+        for target, target_protected in zip(matches, protected):
             logger.info("Clearing hash for %s", target)
             spec_hashes.invalidate(target)
 
             logger.info("Deleting output files of %s", target.name)
             for path in target.flattened_outputs():
-                if path in target.protected():
+                if path in target_protected:
                     logger.info(
                         "Skipping file '%s' from target '%s' because it is protected",
                         click.format_filename(path),
@@ -91,9 +114,15 @@ def clean(ctx, targets, all, force):
                     )
                     continue
 
+                if sizes[path] is None:
+                    continue
+
                 logger.info(
                     'Deleting file "%s" from target "%s"',
                     click.format_filename(path),
                     target.name,
                 )
-                _delete_file(path)
+                to_delete.append(path)
+
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            list(executor.map(_delete_file, to_delete))
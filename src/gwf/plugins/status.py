@@ -107,7 +107,7 @@ def status(ctx, status, endpoints, format, targets):
     graph = Graph.from_targets(workflow.targets, fs)
 
     with create_backend(
-        ctx.backend, working_dir=ctx.working_dir, config=ctx.config
+        ctx.backend, working_dir=ctx.working_dir, config=ctx.config, read_only=True
     ) as backend, get_spec_hashes(
         working_dir=ctx.working_dir, config=ctx.config
     ) as spec_hashes:
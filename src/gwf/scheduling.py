@@ -60,19 +60,20 @@ def schedule(endpoints, graph, fs, spec_hashes, status_func, submit_func):
             if status in SUBMITTED_STATES:
                 submitted_deps.append(dep)
 
-        if status_func(target) == BackendStatus.SUBMITTED:
+        backend_status = status_func(target)
+        if backend_status == BackendStatus.SUBMITTED:
             logger.debug("Target %s is already submitted", target)
             return Status.SUBMITTED
 
-        if status_func(target) == BackendStatus.RUNNING:
+        if backend_status == BackendStatus.RUNNING:
             logger.debug("Target %s is already running", target)
             return Status.RUNNING
 
-        if status_func(target) == BackendStatus.FAILED:
+        if backend_status == BackendStatus.FAILED:
             submit_func(target, dependencies=submitted_deps)
             return Status.FAILED
 
-        if status_func(target) == BackendStatus.CANCELLED:
+        if backend_status == BackendStatus.CANCELLED:
             submit_func(target, dependencies=submitted_deps)
             return Status.CANCELLED
 
@@ -112,20 +113,14 @@ def _submit_noop(target, dependencies, backend, spec_hashes):
     pass
 
 
-def submit_backend(target, dependencies, backend, spec_hashes):
-    """Prepare and submit `target` with `dependencies` to `backend`.
+def _prepare_target(target, backend):
+    """Prepare `target` for submission to `backend`.
 
-    Will prepare the target for submission by injecting option defaults from the
-    backend, check for unsupported options, and removing options with a `None`
-    value.
-
-    This is the primary way to submit a target. Do not call :func:`submit`
-    directly on the backend, unless you want to manually deal with with
-    injection of option defaults.
+    Injects option defaults from the backend, warns about and removes
+    unsupported options, and removes options with a `None` value. Targets must
+    be prepared before being submitted, so do not call :func:`submit` directly
+    on the backend unless you want to deal with this manually.
     """
-
-    logger.info("Submitting target %s", target)
-
     new_options = {}
     if hasattr(backend, "target_defaults"):
         new_options = dict(backend.target_defaults)
@@ -143,26 +138,57 @@ def submit_backend(target, dependencies, backend, spec_hashes):
             del new_options[option_name]
     target.options = new_options
 
-    backend.submit(target, dependencies)
-    spec_hashes.update(target)
-
 
 def submit_workflow(endpoints, graph, fs, spec_hashes, backend, dry_run=False):
-    """Submit a workflow to a backend."""
-    submit_func = partial(
-        _submit_dryrun if dry_run else submit_backend,
-        backend=backend,
-        spec_hashes=spec_hashes,
-    )
+    """Submit a workflow to a backend.
+
+    Targets are first scheduled and prepared, and then handed to the backend
+    in one go. Backends providing a ``submit_many`` method receive all
+    submissions at once, with every target appearing after its dependencies,
+    which allows them to submit independent targets concurrently.
+    """
+    if dry_run:
+        submit_func = partial(_submit_dryrun, backend=backend, spec_hashes=spec_hashes)
+        schedule(
+            endpoints,
+            graph,
+            fs,
+            spec_hashes,
+            status_func=backend.status,
+            submit_func=submit_func,
+        )
+        return
+
+    submissions = []
+
+    def _collect(target, dependencies):
+        logger.info("Submitting target %s", target)
+        _prepare_target(target, backend)
+        submissions.append((target, dependencies))
+
     schedule(
         endpoints,
         graph,
         fs,
         spec_hashes,
         status_func=backend.status,
-        submit_func=submit_func,
+        submit_func=_collect,
     )
 
+    submitted = []
+    try:
+        if hasattr(backend, "submit_many"):
+            backend.submit_many(submissions, on_submit=submitted.append)
+        else:
+            for target, dependencies in submissions:
+                backend.submit(target, dependencies)
+                submitted.append(target)
+    finally:
+        # If a submission failed, the targets submitted before it must still
+        # have their hashes saved, otherwise they will be submitted again.
+        for target in submitted:
+            spec_hashes.update(target)
+
 
 def get_status_map(graph, fs, spec_hashes, backend, endpoints=None):
     """Get the status of each targets in the graph."""
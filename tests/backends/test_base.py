@@ -0,0 +1,247 @@
+import itertools
+import json
+from collections import ChainMap
+
+import attrs
+import pytest
+
+from gwf.backends.base import BackendStatus, TrackingBackend, create_backend
+from gwf.backends.exceptions import BackendError
+from gwf.conf import FileConfig
+from gwf.core import Target
+
+
+@attrs.define
+class FakeOps:
+    states: dict = attrs.field(factory=dict)
+    calls: int = attrs.field(default=0)
+    batches: list = attrs.field(factory=list)
+    submitted: list = attrs.field(factory=list)
+    dependencies: dict = attrs.field(factory=dict)
+    target_defaults: dict = attrs.field(factory=dict)
+    job_ids: itertools.count = attrs.field(factory=lambda: itertools.count(100))
+
+    def get_job_states(self, tracked_jobs):
+        self.calls += 1
+        return {job_id: self.states[job_id] for job_id in tracked_jobs}
+
+    def submit_target(self, target, dependencies):
+        assert all(dep in self.states for dep in dependencies)
+        job_id = str(next(self.job_ids))
+        self.states[job_id] = BackendStatus.SUBMITTED
+        self.submitted.append(target.name)
+        self.dependencies[target.name] = dependencies
+        return job_id
+
+    def submit_targets(self, targets):
+        self.batches.append([target.name for target in targets])
+        return [self.submit_target(target, []) for target in targets]
+
+    def cancel_job(self, job_id):
+        if self.states[job_id] == BackendStatus.COMPLETED:
+            raise BackendError(f"Job {job_id} has already completed")
+        self.states[job_id] = BackendStatus.CANCELLED
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def working_dir(tmp_path):
+    tmp_path.joinpath(".gwf").mkdir()
+    tmp_path.joinpath(".gwf", "fake-backend-tracked.json").write_text(
+        json.dumps({"Target1": "1"})
+    )
+    return tmp_path
+
+
+def make_target(name, **options):
+    return Target(
+        name, inputs=[], outputs=[], options=options, working_dir="/some/path"
+    )
+
+
+def test_job_states_are_cached_between_instances(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops, state_cache_ttl=60):
+        pass
+    ops.states["1"] = BackendStatus.COMPLETED
+
+    target = make_target("Target1")
+    with TrackingBackend(working_dir, "fake", ops, state_cache_ttl=60) as backend:
+        assert backend.status(target) == BackendStatus.RUNNING
+    assert ops.calls == 1
+
+
+@pytest.mark.parametrize(
+    "content", ['[["1", "BOGUS"]]', '[["1"]]', '{"1": "RUNNING"}', "not json"]
+)
+def test_malformed_job_state_cache_is_discarded(working_dir, content):
+    cache_path = working_dir.joinpath(".gwf", "fake-backend-states.json")
+    cache_path.write_text(content)
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    backend = TrackingBackend(working_dir, "fake", ops, state_cache_ttl=60)
+    assert backend.status(make_target("Target1")) == BackendStatus.RUNNING
+    assert ops.calls == 1
+    assert json.loads(cache_path.read_text()) == [["1", "RUNNING"]]
+
+
+@pytest.mark.parametrize("read_only,expected_ttl", [(True, 60), (False, 0)])
+def test_state_cache_is_only_used_by_read_only_backends(
+    working_dir, monkeypatch, read_only, expected_ttl
+):
+    def fake_backend(working_dir, state_cache_ttl=0):
+        return TrackingBackend(
+            working_dir,
+            "fake",
+            FakeOps(states={"1": BackendStatus.RUNNING}),
+            state_cache_ttl=state_cache_ttl,
+        )
+
+    monkeypatch.setattr(
+        "gwf.backends.base.discover_backends", lambda: {"fake": (fake_backend, 0)}
+    )
+    config = FileConfig(path=None, data=ChainMap({"backend.fake.state_cache_ttl": 60}))
+    backend = create_backend("fake", working_dir, config, read_only=read_only)
+    assert backend.state_cache_ttl == expected_ttl
+
+
+def test_job_states_are_not_cached_when_ttl_is_zero(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops):
+        pass
+    with TrackingBackend(working_dir, "fake", ops):
+        pass
+    assert ops.calls == 2
+    assert not working_dir.joinpath(".gwf", "fake-backend-states.json").exists()
+
+
+def test_job_state_cache_is_invalidated_by_submit(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops, state_cache_ttl=60) as backend:
+        backend.submit(make_target("Target2"), dependencies=[])
+    with TrackingBackend(working_dir, "fake", ops, state_cache_ttl=60):
+        pass
+    assert ops.calls == 2
+
+
+def test_batch_submit_groups_independent_targets_by_options(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops, batch_submit=True) as backend:
+        backend.submit(make_target("A", cores=1), dependencies=[])
+        backend.submit(make_target("B", cores=1), dependencies=[])
+        backend.submit(make_target("C", cores=2), dependencies=[])
+        assert ops.batches == []
+    assert ops.batches == [["A", "B"]]
+
+    with TrackingBackend(working_dir, "fake", ops) as backend:
+        for name in ("A", "B", "C"):
+            assert backend.status(make_target(name)) == BackendStatus.SUBMITTED
+
+
+def test_batch_submit_splits_large_batches(working_dir, monkeypatch):
+    monkeypatch.setattr("gwf.backends.base.BATCH_SUBMIT_MAX_SIZE", 2)
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops, batch_submit=True) as backend:
+        for name in "ABCDE":
+            backend.submit(make_target(name), dependencies=[])
+    assert ops.batches == [["A", "B"], ["C", "D"]]
+    assert ops.submitted == ["A", "B", "C", "D", "E"]
+
+
+def test_batch_submit_does_not_depend_on_previous_job_ids(working_dir):
+    working_dir.joinpath(".gwf", "fake-backend-tracked.json").write_text(
+        json.dumps({"A": "1", "B": "2"})
+    )
+    ops = FakeOps(states={"1": BackendStatus.FAILED, "2": BackendStatus.FAILED})
+    a, b = make_target("A"), make_target("B")
+    with TrackingBackend(working_dir, "fake", ops, batch_submit=True) as backend:
+        backend.submit_many([(a, []), (b, [a])])
+    assert ops.submitted == ["A", "B"]
+    assert ops.dependencies["B"] == ["100"]
+
+
+def test_submit_many_submits_batches_before_returning(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    a, b = make_target("A"), make_target("B")
+    with TrackingBackend(working_dir, "fake", ops, batch_submit=True) as backend:
+        backend.submit_many([(a, []), (b, [])])
+        assert ops.batches == [["A", "B"]]
+        assert backend.status(a) == BackendStatus.SUBMITTED
+
+
+def test_batch_submit_flushes_before_dependent_is_submitted(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    a, b = make_target("A"), make_target("B")
+    with TrackingBackend(working_dir, "fake", ops, batch_submit=True) as backend:
+        backend.submit(a, dependencies=[])
+        backend.submit(b, dependencies=[])
+        backend.submit(make_target("C"), dependencies=[a, b])
+        assert ops.batches == [["A", "B"]]
+
+
+def test_submit_many_submits_dependencies_first(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    a, b, c, d = (make_target(name) for name in "ABCD")
+    submissions = [(a, []), (b, [a]), (c, [a]), (d, [b, c])]
+    with TrackingBackend(working_dir, "fake", ops, submit_workers=4) as backend:
+        backend.submit_many(submissions)
+        assert ops.submitted[0] == "A"
+        assert set(ops.submitted[1:3]) == {"B", "C"}
+        assert ops.submitted[3] == "D"
+        assert all(backend.status(t) == BackendStatus.SUBMITTED for t in (a, b, c, d))
+
+
+@pytest.mark.parametrize("options", [{"submit_workers": 4}, {"batch_submit": True}, {}])
+def test_submit_many_reports_submitted_targets(working_dir, options):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    a, b, c = (make_target(name) for name in "ABC")
+    submitted = []
+    with TrackingBackend(working_dir, "fake", ops, **options) as backend:
+        backend.submit_many([(a, []), (b, []), (c, [a])], on_submit=submitted.append)
+    assert sorted(t.name for t in submitted) == ["A", "B", "C"]
+
+
+def test_tracked_jobs_are_appended_to_log_and_compacted(working_dir, monkeypatch):
+    monkeypatch.setattr("gwf.backends.base.STATE_LOG_COMPACT_MIN_SIZE", 10)
+    snapshot_path = working_dir.joinpath(".gwf", "fake-backend-tracked.json")
+    log_path = working_dir.joinpath(".gwf", "fake-backend-tracked.log")
+
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops) as backend:
+        backend.submit(make_target("A"), dependencies=[])
+    assert json.loads(snapshot_path.read_text()) == {"Target1": "1"}
+    assert log_path.read_text() == '["A", "100"]\n'
+
+    with TrackingBackend(working_dir, "fake", ops) as backend:
+        assert backend.status(make_target("A")) == BackendStatus.SUBMITTED
+        for idx in range(20):
+            backend.submit(make_target(f"T{idx}"), dependencies=[])
+    assert not log_path.exists()
+    assert len(json.loads(snapshot_path.read_text())) == 22
+
+
+def test_cancel_many_only_cancels_active_jobs(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops) as backend:
+        backend.submit(make_target("A"), dependencies=[])
+        ops.states["100"] = BackendStatus.COMPLETED
+    with TrackingBackend(working_dir, "fake", ops) as backend:
+        not_cancelled = backend.cancel_many(
+            [make_target("Target1"), make_target("A"), make_target("B")]
+        )
+    assert [t.name for t in not_cancelled] == ["A", "B"]
+    assert ops.states["1"] == BackendStatus.CANCELLED
+
+
+def test_cancel_many_returns_targets_that_failed_to_cancel(working_dir):
+    ops = FakeOps(states={"1": BackendStatus.RUNNING})
+    with TrackingBackend(working_dir, "fake", ops) as backend:
+        backend.submit(make_target("A"), dependencies=[])
+        backend.submit(make_target("B"), dependencies=[])
+    with TrackingBackend(working_dir, "fake", ops) as backend:
+        # A completes after its state was read, so cancelling it fails.
+        ops.states["100"] = BackendStatus.COMPLETED
+        not_cancelled = backend.cancel_many([make_target("A"), make_target("B")])
+    assert [t.name for t in not_cancelled] == ["A"]
+    assert ops.states["101"] == BackendStatus.CANCELLED
@@ -1,9 +1,20 @@
 import asyncio
+import json
+import socket
 
 import pytest
 import pytest_asyncio
 
-from gwf.backends.local import Client, LocalStatus, Scheduler
+from gwf.backends import local
+from gwf.backends.local import (
+    HEADER,
+    Client,
+    LocalStatus,
+    Scheduler,
+    Server,
+    decode,
+    encode,
+)
 
 
 @pytest_asyncio.fixture
@@ -120,3 +131,98 @@ async def test_task_writes_log_file(s):
 def test_client_connection_failure():
     with pytest.raises(Exception):
         Client.connect("localhost", 54321, attempts=1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_task_is_stopped_promptly(s):
+    tid = await s.enqueue_task("foo", "sleep 30", ".", None, set())
+    await asyncio.sleep(0.1)
+    await s.cancel_task(tid)
+    await s.wait_for({tid}, timeout=0.5)
+    assert s.tasks[tid].done()
+    assert s.get_task_state(tid) == LocalStatus.CANCELLED
+
+
+@pytest.fixture(params=["json", "orjson"])
+def serializer(request, monkeypatch):
+    if request.param == "orjson":
+        orjson = pytest.importorskip("orjson")
+        monkeypatch.setattr(local, "_dumps", local._orjson_dumps)
+        monkeypatch.setattr(local, "_loads", orjson.loads)
+    else:
+        monkeypatch.setattr(local, "_dumps", local._json_dumps)
+        monkeypatch.setattr(local, "_loads", json.loads)
+    return request.param
+
+
+def test_client_messages_are_length_prefixed(serializer):
+    left, right = socket.socketpair()
+    with left, right:
+        client = Client.from_socket(left)
+        server = Client.from_socket(right)
+        client.send("enqueue_task", script="x" * 1000)
+        kind, msg = server.recv()
+    assert kind == "enqueue_task"
+    assert msg == {"script": "x" * 1000}
+
+
+def test_messages_round_trip(serializer):
+    data = encode("task_states", tasks={1: LocalStatus.RUNNING.value}, deps={3})
+    assert HEADER.unpack(data[: HEADER.size]) == (len(data) - HEADER.size,)
+    kind, msg = decode(data[HEADER.size :])
+    assert kind == "task_states"
+    assert msg == {"tasks": {"1": LocalStatus.RUNNING.value}, "deps": [3]}
+
+
+class FakeWriter:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+    async def drain(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_task_states_response_is_reused_until_states_change(s):
+    server = Server(s)
+    writer = FakeWriter()
+    tid = await s.enqueue_task("foo", "exit 0", ".", None, set())
+    await server.handle_get_task_states(writer)
+    await server.handle_get_task_states(writer)
+    assert writer.written[0] is writer.written[1]
+
+    await s.wait_for({tid})
+    await server.handle_get_task_states(writer)
+    assert writer.written[2] != writer.written[1]
+    _, msg = decode(writer.written[2][HEADER.size :])
+    assert msg == {"tasks": {str(tid): LocalStatus.COMPLETED.value}}
+
+
+@pytest.mark.asyncio
+async def test_skipped_tasks_do_not_free_cores(s):
+    tid1 = await s.enqueue_task("foo", "exit 1", ".", None, set())
+    tid2 = await s.enqueue_task("foo", "exit 0", ".", None, set([tid1]))
+    await s.wait_for({tid1, tid2})
+    assert s.get_task_state(tid2) == LocalStatus.FAILED
+
+    tid3 = await s.enqueue_task("foo", "sleep 1", ".", None, set())
+    tid4 = await s.enqueue_task("foo", "sleep 1", ".", None, set())
+    await asyncio.sleep(0.2)
+    states = {s.get_task_state(tid3), s.get_task_state(tid4)}
+    assert states == {LocalStatus.RUNNING, LocalStatus.SUBMITTED}
+    await s.wait_for({tid3, tid4})
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_fails_task_before_other_dependencies_finish(s):
+    tid1 = await s.enqueue_task("foo", "exit 1", ".", None, set())
+    tid2 = await s.enqueue_task("foo", "sleep 5", ".", None, set())
+    tid3 = await s.enqueue_task("foo", "exit 0", ".", None, set([tid1, tid2]))
+    await s.wait_for({tid3}, timeout=2)
+    assert s.get_task_state(tid3) == LocalStatus.FAILED
+    assert s.get_task_state(tid2) == LocalStatus.RUNNING
+    await s.cancel_task(tid2)
+    await s.wait_for({tid2})
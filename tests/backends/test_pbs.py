@@ -0,0 +1,30 @@
+from gwf.backends.base import BackendStatus
+from gwf.backends.pbs import parse_qstat_full
+
+QSTAT_OUTPUT = """\
+Job Id: 123.server.example.org
+    Job_Name = Target1
+    job_state = R
+    queue = normal
+
+Job Id: 124.server.example.org
+    Job_Name = Target2
+    job_state = Q
+    queue = normal
+
+Job Id: 125.server.example.org
+    Job_Name = Target3
+    job_state = X
+"""
+
+
+def test_parse_qstat_full():
+    assert parse_qstat_full(QSTAT_OUTPUT) == {
+        "123": BackendStatus.RUNNING,
+        "124": BackendStatus.SUBMITTED,
+        "125": BackendStatus.UNKNOWN,
+    }
+
+
+def test_parse_qstat_full_empty_output():
+    assert parse_qstat_full("") == {}
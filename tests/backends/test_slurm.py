@@ -0,0 +1,126 @@
+from gwf.backends.base import BackendStatus
+from gwf.backends.exceptions import BackendError
+from gwf.backends.slurm import TARGET_DEFAULTS, SlurmOps
+from gwf.core import Target
+
+
+def make_target(name, spec):
+    target = Target(
+        name,
+        inputs=[],
+        outputs=[],
+        options={"cores": 2, "memory": "4g"},
+        working_dir="/some/path",
+    )
+    target.spec = spec
+    return target
+
+
+def test_compile_array_script():
+    ops = SlurmOps("/work", "full", True, target_defaults=TARGET_DEFAULTS)
+    script = ops.compile_array_script(
+        [make_target("Foo", "echo foo"), make_target("Bar", "echo bar")]
+    )
+    lines = script.splitlines()
+    assert "#SBATCH -c 2" in lines
+    assert "#SBATCH --mem=4g" in lines
+    assert "#SBATCH --array=0-1" in lines
+    assert "#SBATCH --output=/work/.gwf/logs/gwf-array-%A_%a.stdout" in lines
+    assert "#SBATCH --error=/work/.gwf/logs/gwf-array-%A_%a.stderr" in lines
+    assert 'case "$SLURM_ARRAY_TASK_ID" in' in lines
+    assert "exec >/work/.gwf/logs/Foo.stdout 2>/work/.gwf/logs/Foo.stderr" in lines
+    assert "export GWF_JOBID=${SLURM_ARRAY_JOB_ID}_${SLURM_ARRAY_TASK_ID}" in lines
+    assert lines.index("0)") < lines.index("echo foo") < lines.index("1)")
+    assert lines.index("1)") < lines.index("echo bar") < lines.index("esac")
+
+
+def test_submit_targets_returns_array_task_ids(mocker):
+    call = mocker.patch("gwf.backends.slurm.call", return_value="1234\n")
+    ops = SlurmOps("/work", "full", True, target_defaults=TARGET_DEFAULTS)
+    job_ids = ops.submit_targets(
+        [make_target("Foo", "echo foo"), make_target("Bar", "echo bar")]
+    )
+    assert job_ids == ["1234_0", "1234_1"]
+    assert call.call_args.args == ("sbatch", "--parsable")
+
+
+def test_get_job_states_from_squeue_only_includes_tracked_jobs(mocker):
+    mocker.patch(
+        "gwf.backends.slurm.call",
+        return_value="1;R\n2;PD\n3_0;CG\n4;R\n",
+    )
+    ops = SlurmOps("/work", "full", True, target_defaults=TARGET_DEFAULTS)
+    assert ops.get_job_states_from_squeue(["1", "2", "3_0"]) == {
+        "1": BackendStatus.RUNNING,
+        "2": BackendStatus.SUBMITTED,
+        "3_0": BackendStatus.RUNNING,
+    }
+
+
+def test_compile_script():
+    ops = SlurmOps("/work", "merged", True, target_defaults=TARGET_DEFAULTS)
+    script = ops.compile_script(make_target("Foo", "echo foo"))
+    assert script == (
+        "#!/bin/bash\n"
+        "# Generated by: gwf\n"
+        "#SBATCH --job-name=Foo\n"
+        "#SBATCH -c 2\n"
+        "#SBATCH --mem=4g\n"
+        "#SBATCH --output=/work/.gwf/logs/Foo.stdout\n"
+        "\n"
+        "cd /some/path\n"
+        "export GWF_JOBID=$SLURM_JOBID\n"
+        'export GWF_TARGET_NAME="Foo"\n'
+        "set -e\n"
+        "\n"
+        "echo foo\n"
+    )
+
+
+def test_get_job_states_from_sacct(mocker):
+    mocker.patch(
+        "gwf.backends.slurm.call",
+        return_value="1|COMPLETED\n2|CANCELLED by 1234\n3|REQUEUE_HOLD\n",
+    )
+    ops = SlurmOps("/work", "full", True, target_defaults=TARGET_DEFAULTS)
+    assert ops.get_job_states_from_sacct(["1", "2", "3"]) == {
+        "1": BackendStatus.COMPLETED,
+        "2": BackendStatus.CANCELLED,
+        "3": BackendStatus.UNKNOWN,
+    }
+
+
+def test_cancel_jobs_in_batches(mocker):
+    call = mocker.patch("gwf.backends.slurm.call", return_value="")
+    ops = SlurmOps("/work", "full", True, target_defaults=TARGET_DEFAULTS)
+    assert ops.cancel_jobs(["1", "2", "3"], batch_size=2) == []
+    assert [c.args for c in call.call_args_list] == [
+        ("scancel", "--verbose", "1", "2"),
+        ("scancel", "--verbose", "3"),
+    ]
+
+
+def test_cancel_jobs_retries_failed_batch_one_by_one(mocker):
+    def fake_scancel(*args):
+        if "2" in args:
+            raise BackendError("scancel: error: Invalid job id specified")
+        return ""
+
+    call = mocker.patch("gwf.backends.slurm.call", side_effect=fake_scancel)
+    ops = SlurmOps("/work", "full", True, target_defaults=TARGET_DEFAULTS)
+    assert ops.cancel_jobs(["1", "2", "3", "4"], batch_size=2) == ["2"]
+    assert [c.args for c in call.call_args_list] == [
+        ("scancel", "--verbose", "1", "2"),
+        ("scancel", "--verbose", "1"),
+        ("scancel", "--verbose", "2"),
+        ("scancel", "--verbose", "3", "4"),
+    ]
+
+
+def test_compile_script_does_not_mix_up_equal_option_values():
+    ops = SlurmOps("/work", "full", True, target_defaults=TARGET_DEFAULTS)
+    target1, target2 = make_target("Foo", "echo foo"), make_target("Bar", "echo bar")
+    target1.options = {"cores": 2.0}
+    target2.options = {"cores": 2}
+    assert "#SBATCH -c 2.0" in ops.compile_script(target1).splitlines()
+    assert "#SBATCH -c 2" in ops.compile_script(target2).splitlines()
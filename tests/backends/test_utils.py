@@ -0,0 +1,36 @@
+import pytest
+
+from gwf.backends.exceptions import BackendError
+from gwf.backends.utils import _find_exe, _which, has_exe
+
+
+@pytest.fixture(autouse=True)
+def clear_which_cache():
+    _which.cache_clear()
+    yield
+    _which.cache_clear()
+
+
+def test_executable_path_can_be_overridden_by_environment(monkeypatch, tmp_path):
+    exe = tmp_path.joinpath("notarealcommand")
+    exe.write_text("#!/bin/sh\n")
+    exe.chmod(0o755)
+    monkeypatch.setenv("GWF_NOTAREALCOMMAND_PATH", str(exe))
+    assert _which("notarealcommand") == str(exe)
+    assert has_exe("notarealcommand")
+
+
+def test_executable_path_override_is_resolved(monkeypatch, tmp_path):
+    exe = tmp_path.joinpath("notarealcommand")
+    exe.write_text("#!/bin/sh\n")
+    exe.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.setenv("GWF_OTHERCOMMAND_PATH", "notarealcommand")
+    assert _which("othercommand") == str(exe)
+
+
+def test_invalid_executable_path_override(monkeypatch, tmp_path):
+    monkeypatch.setenv("GWF_NOTAREALCOMMAND_PATH", str(tmp_path / "missing"))
+    assert not has_exe("notarealcommand")
+    with pytest.raises(BackendError, match="GWF_NOTAREALCOMMAND_PATH"):
+        _find_exe("notarealcommand")
@@ -45,3 +45,12 @@ def test_clean_output_from_two_targets(cli_runner):
 
     assert not os.path.exists("a.txt")
     assert not os.path.exists("b.txt")
+
+
+def test_clean_deletes_dangling_symlinks(cli_runner):
+    os.remove("a.txt")
+    os.symlink("does-not-exist.txt", "a.txt")
+    args = ["clean"]
+    cli_runner.invoke(main, args, input="y\n")
+
+    assert not os.path.lexists("a.txt")
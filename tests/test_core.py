@@ -2,6 +2,8 @@ import unittest
 
 import pytest
 
+from gwf.backends.base import BackendStatus
+from gwf.backends.exceptions import BackendError
 from gwf.core import (
     CircularDependencyError,
     FileProvidedByMultipleTargetsError,
@@ -14,7 +16,7 @@ from gwf.core import (
     _flatten,
 )
 from gwf.exceptions import GWFError
-from gwf.scheduling import get_status_map
+from gwf.scheduling import get_status_map, submit_workflow
 
 
 @pytest.mark.parametrize(
@@ -497,3 +499,39 @@ def test_scheduling_with_spec_hashing(backend, spec_hashes, filesystem):
         spec_hashes=spec_hashes,
     )
     assert target_states[target] == Status.SHOULDRUN
+
+
+class FailingBackend:
+    """A backend that fails to submit one target and never reports any state."""
+
+    target_defaults = {}
+
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+
+    def submit(self, target, dependencies):
+        if target.name == self.fail_on:
+            raise BackendError("submission failed")
+
+    def status(self, target):
+        return BackendStatus.UNKNOWN
+
+
+def test_submit_workflow_saves_hashes_of_submitted_targets_on_failure(
+    spec_hashes, filesystem
+):
+    target1 = Target(
+        "Target1", inputs=[], outputs=["a.txt"], options={}, working_dir="/some/dir"
+    )
+    target2 = Target(
+        "Target2", inputs=[], outputs=["b.txt"], options={}, working_dir="/some/dir"
+    )
+    graph = Graph.from_targets([target1, target2], filesystem)
+    backend = FailingBackend(fail_on="Target2")
+
+    with pytest.raises(BackendError):
+        submit_workflow(
+            graph.endpoints(), graph, filesystem, spec_hashes, backend=backend
+        )
+    assert target1 in spec_hashes.hashes
+    assert target2 not in spec_hashes.hashes